@@ -3,30 +3,44 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import PREVIEW_BATCH_MAX_USERS
 from app.core.database import get_db
 from app.db.models import ContestSubscription, User
+from app.dependencies.admission import dispatch_limiter, preview_batch_limiter, subscriptions_limiter
 from app.models.contest import Contest
 from app.models.user import (
     ContestSubscriptionCreate,
     ContestSubscriptionOut,
     NotificationDispatchResponse,
     NotificationPreview,
+    NotificationPreviewBatchRequest,
     UserCreate,
+    UserNotificationPreview,
     UserOut,
 )
 from app.services.codeforces import CodeforcesService
+from app.services.ical import calendar_cache, render_calendar
 from app.services.notifications import (
     already_sent,
+    build_notification_previews,
     build_reminder_schedule,
     format_local_times,
     is_due,
     mark_sent,
     send_email_notification,
 )
+from app.services.users import (
+    get_subscriptions_for_users,
+    get_user_settings,
+    get_user_with_subscriptions,
+    get_users_settings,
+    user_cache,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 service = CodeforcesService()
@@ -47,23 +61,66 @@ async def create_user(payload: UserCreate, db: AsyncSession = Depends(get_db)) -
     db.add(user)
     await db.commit()
     await db.refresh(user)
-    return user
+    user_out = UserOut.model_validate(user)
+    user_cache.put(user_out)
+    return user_out
+
+
+@router.post(
+    "/notification-preview",
+    response_model=List[UserNotificationPreview],
+    dependencies=[Depends(preview_batch_limiter)],
+)
+async def preview_notifications_batch(
+    payload: NotificationPreviewBatchRequest,
+    db: AsyncSession = Depends(get_db),
+) -> List[UserNotificationPreview]:
+    if not payload.user_ids:
+        raise HTTPException(status_code=400, detail="user_ids cannot be empty")
+
+    user_ids = list(dict.fromkeys(payload.user_ids))
+    if len(user_ids) > PREVIEW_BATCH_MAX_USERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {PREVIEW_BATCH_MAX_USERS} user_ids can be previewed at once",
+        )
+
+    users_by_id = await get_users_settings(db, user_ids)
+    missing = [user_id for user_id in user_ids if user_id not in users_by_id]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Users not found: {missing}")
+
+    subs = await get_subscriptions_for_users(db, user_ids)
+    # Scheduling and formatting are CPU-bound; keep them off the event loop
+    previews = await run_in_threadpool(
+        build_notification_previews, subs, [users_by_id[sub.user_id] for sub in subs]
+    )
+
+    grouped: dict[int, List[NotificationPreview]] = {user_id: [] for user_id in user_ids}
+    for sub, preview in zip(subs, previews):
+        grouped[sub.user_id].append(preview)
+    return [UserNotificationPreview(user_id=user_id, previews=grouped[user_id]) for user_id in user_ids]
 
 
 @router.get("/{user_id}", response_model=UserOut)
 async def get_user(user_id: int, db: AsyncSession = Depends(get_db)) -> UserOut:
-    user = await db.get(User, user_id)
+    user = await get_user_settings(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
-@router.post("/{user_id}/subscriptions", response_model=List[ContestSubscriptionOut])
+@router.post(
+    "/{user_id}/subscriptions",
+    response_model=List[ContestSubscriptionOut],
+    dependencies=[Depends(subscriptions_limiter)],
+)
 async def save_subscriptions(
     user_id: int,
     payload: ContestSubscriptionCreate,
     db: AsyncSession = Depends(get_db),
 ) -> List[ContestSubscriptionOut]:
+    # Read the row itself: a cached profile may outlive a delete made by another worker
     user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -112,6 +169,7 @@ async def save_subscriptions(
         saved.append(sub)
 
     await db.commit()
+    calendar_cache.invalidate(user_id)
     for sub in saved:
         await db.refresh(sub)
     return saved
@@ -119,51 +177,58 @@ async def save_subscriptions(
 
 @router.get("/{user_id}/subscriptions", response_model=List[ContestSubscriptionOut])
 async def list_subscriptions(user_id: int, db: AsyncSession = Depends(get_db)) -> List[ContestSubscriptionOut]:
-    user = await db.get(User, user_id)
-    if not user:
+    loaded = await get_user_with_subscriptions(db, user_id)
+    if not loaded:
         raise HTTPException(status_code=404, detail="User not found")
 
-    result = await db.execute(select(ContestSubscription).where(ContestSubscription.user_id == user_id))
-    return list(result.scalars())
+    _, subs = loaded
+    return subs
+
+
+@router.get("/{user_id}/calendar.ics", response_class=Response)
+async def calendar_feed(
+    user_id: int,
+    if_none_match: str | None = Header(default=None),
+    if_modified_since: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    # Cache hits never issue a query, so conditional polls skip MySQL entirely
+    feed = calendar_cache.get(user_id)
+    if feed is None:
+        generation = calendar_cache.generation(user_id)
+        loaded = await get_user_with_subscriptions(db, user_id)
+        if not loaded:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        user, subs = loaded
+        feed = calendar_cache.store(user_id, generation, render_calendar(user, subs))
+
+    if feed.is_not_modified(if_none_match, if_modified_since):
+        return Response(status_code=304, headers=feed.headers())
+    return Response(content=feed.body, media_type="text/calendar; charset=utf-8", headers=feed.headers())
 
 
 @router.get("/{user_id}/notification-preview", response_model=List[NotificationPreview])
 async def preview_notifications(user_id: int, db: AsyncSession = Depends(get_db)) -> List[NotificationPreview]:
-    user = await db.get(User, user_id)
-    if not user:
+    loaded = await get_user_with_subscriptions(db, user_id)
+    if not loaded:
         raise HTTPException(status_code=404, detail="User not found")
 
-    result = await db.execute(select(ContestSubscription).where(ContestSubscription.user_id == user_id))
-    subs = list(result.scalars())
+    user, subs = loaded
+    return build_notification_previews(subs, [user] * len(subs))
 
-    previews: List[NotificationPreview] = []
-    for sub in subs:
-        reminders = build_reminder_schedule(
-            sub.start_time_utc,
-            user.reminder_count,
-            user.reminder_start_minutes,
-            user.reminder_interval_minutes,
-        )
-        previews.append(
-            NotificationPreview(
-                contest_id=sub.contest_id,
-                contest_name=sub.contest_name,
-                start_time_utc=sub.start_time_utc,
-                reminders_utc=reminders,
-                reminders_local_formatted=format_local_times(reminders, user.timezone),
-            )
-        )
-    return previews
 
-
-@router.post("/{user_id}/notifications/dispatch", response_model=NotificationDispatchResponse)
+@router.post(
+    "/{user_id}/notifications/dispatch",
+    response_model=NotificationDispatchResponse,
+    dependencies=[Depends(dispatch_limiter)],
+)
 async def dispatch_notifications(user_id: int, db: AsyncSession = Depends(get_db)) -> NotificationDispatchResponse:
-    user = await db.get(User, user_id)
-    if not user:
+    loaded = await get_user_with_subscriptions(db, user_id)
+    if not loaded:
         raise HTTPException(status_code=404, detail="User not found")
 
-    result = await db.execute(select(ContestSubscription).where(ContestSubscription.user_id == user_id))
-    subs = list(result.scalars())
+    user, subs = loaded
     sent_count = 0
     errors: List[str] = []
     now = datetime.now(timezone.utc)
@@ -179,7 +244,7 @@ async def dispatch_notifications(user_id: int, db: AsyncSession = Depends(get_db
         for reminder_time in schedule:
             if not is_due(reminder_time, now):
                 continue
-            if await already_sent(db, sub.id, reminder_time):
+            if await already_sent(db, sub.subscription_id, reminder_time):
                 continue
 
             try:
@@ -192,7 +257,7 @@ async def dispatch_notifications(user_id: int, db: AsyncSession = Depends(get_db
                 errors.append(str(exc))
                 continue
 
-            await mark_sent(db, sub.id, reminder_time)
+            await mark_sent(db, sub.subscription_id, reminder_time)
             sent_count += 1
 
     return NotificationDispatchResponse(sent_count=sent_count, errors=errors)
@@ -22,3 +22,31 @@ DB_NAME = os.getenv("DB_NAME", "codeforces")
 # AWS SES configuration for email notifications
 AWS_SES_REGION = os.getenv("AWS_SES_REGION", "us-east-1")
 AWS_SES_SENDER = os.getenv("AWS_SES_SENDER", "")
+
+# Admission control for the slow routes: saving subscriptions and dispatching
+# notifications call Codeforces/SES while holding a DB session, and the batch preview
+# reads many users at once. Keep their combined concurrency (6 + 4 + 2) below the
+# SQLAlchemy pool size (5 + 10 overflow) so the DB reads that are not limited
+# (calendar.ics, notification-preview, GET subscriptions) still get a connection.
+SUBSCRIPTIONS_MAX_CONCURRENCY = int(os.getenv("SUBSCRIPTIONS_MAX_CONCURRENCY", "6"))
+SUBSCRIPTIONS_MAX_QUEUE_SECONDS = float(os.getenv("SUBSCRIPTIONS_MAX_QUEUE_SECONDS", "2"))
+SUBSCRIPTIONS_MAX_WAITING = int(os.getenv("SUBSCRIPTIONS_MAX_WAITING", "24"))
+DISPATCH_MAX_CONCURRENCY = int(os.getenv("DISPATCH_MAX_CONCURRENCY", "4"))
+DISPATCH_MAX_QUEUE_SECONDS = float(os.getenv("DISPATCH_MAX_QUEUE_SECONDS", "5"))
+DISPATCH_MAX_WAITING = int(os.getenv("DISPATCH_MAX_WAITING", "8"))
+PREVIEW_BATCH_MAX_CONCURRENCY = int(os.getenv("PREVIEW_BATCH_MAX_CONCURRENCY", "2"))
+PREVIEW_BATCH_MAX_QUEUE_SECONDS = float(os.getenv("PREVIEW_BATCH_MAX_QUEUE_SECONDS", "2"))
+PREVIEW_BATCH_MAX_WAITING = int(os.getenv("PREVIEW_BATCH_MAX_WAITING", "8"))
+PREVIEW_BATCH_MAX_USERS = int(os.getenv("PREVIEW_BATCH_MAX_USERS", "500"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "5"))
+
+# Per-process cache of rendered calendar feeds. Writes invalidate the feed on the
+# worker that handled them; other workers keep serving their copy until the TTL
+# expires, so a feed can lag a subscription change by up to an hour. Calendar clients
+# poll every few hours at most, so a shorter TTL mostly turns 304s into MySQL reads.
+CALENDAR_CACHE_TTL_SECONDS = int(os.getenv("CALENDAR_CACHE_TTL_SECONDS", "3600"))
+CALENDAR_CACHE_MAX_ENTRIES = int(os.getenv("CALENDAR_CACHE_MAX_ENTRIES", "10000"))
+
+# Per-process cache of user profiles read by the polling-heavy user routes
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Dict, List
+
+from fastapi import HTTPException
+
+from app.core.config import (
+    ADMISSION_RETRY_AFTER_SECONDS,
+    DISPATCH_MAX_CONCURRENCY,
+    DISPATCH_MAX_QUEUE_SECONDS,
+    DISPATCH_MAX_WAITING,
+    PREVIEW_BATCH_MAX_CONCURRENCY,
+    PREVIEW_BATCH_MAX_QUEUE_SECONDS,
+    PREVIEW_BATCH_MAX_WAITING,
+    SUBSCRIPTIONS_MAX_CONCURRENCY,
+    SUBSCRIPTIONS_MAX_QUEUE_SECONDS,
+    SUBSCRIPTIONS_MAX_WAITING,
+)
+
+
+class AdmissionLimiter:
+    """Route dependency that caps concurrent requests and sheds the overflow with 503.
+
+    Requests wait at most ``max_queue_seconds`` for a slot, and no more than
+    ``max_waiting`` may wait at once; anything beyond that is rejected immediately
+    so slow routes cannot pile up DB sessions while cheap routes starve.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue_seconds: float,
+        max_waiting: int,
+        retry_after_seconds: int = ADMISSION_RETRY_AFTER_SECONDS,
+    ) -> None:
+        self.name = name
+        self._max_concurrency = max_concurrency
+        self._max_queue_seconds = max_queue_seconds
+        self._max_waiting = max_waiting
+        self._retry_after_seconds = retry_after_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._active = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._shed = 0
+
+    async def __call__(self) -> AsyncIterator[None]:
+        if not self._semaphore.locked():
+            # A free slot is taken without suspending, so bursts see an accurate count
+            await self._semaphore.acquire()
+        else:
+            if self._waiting >= self._max_waiting:
+                self._reject()
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self._max_queue_seconds)
+            except asyncio.TimeoutError:
+                self._reject()
+            finally:
+                self._waiting -= 1
+
+        self._active += 1
+        self._admitted += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+    def _reject(self) -> None:
+        self._shed += 1
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server is busy handling {self.name} requests, retry later",
+            headers={"Retry-After": str(self._retry_after_seconds)},
+        )
+
+    def snapshot(self) -> Dict[str, int | float | str]:
+        return {
+            "name": self.name,
+            "max_concurrency": self._max_concurrency,
+            "max_queue_seconds": self._max_queue_seconds,
+            "max_waiting": self._max_waiting,
+            "active": self._active,
+            "waiting": self._waiting,
+            "admitted": self._admitted,
+            "shed": self._shed,
+        }
+
+
+subscriptions_limiter = AdmissionLimiter(
+    "save_subscriptions",
+    max_concurrency=SUBSCRIPTIONS_MAX_CONCURRENCY,
+    max_queue_seconds=SUBSCRIPTIONS_MAX_QUEUE_SECONDS,
+    max_waiting=SUBSCRIPTIONS_MAX_WAITING,
+)
+dispatch_limiter = AdmissionLimiter(
+    "dispatch_notifications",
+    max_concurrency=DISPATCH_MAX_CONCURRENCY,
+    max_queue_seconds=DISPATCH_MAX_QUEUE_SECONDS,
+    max_waiting=DISPATCH_MAX_WAITING,
+)
+preview_batch_limiter = AdmissionLimiter(
+    "preview_notifications_batch",
+    max_concurrency=PREVIEW_BATCH_MAX_CONCURRENCY,
+    max_queue_seconds=PREVIEW_BATCH_MAX_QUEUE_SECONDS,
+    max_waiting=PREVIEW_BATCH_MAX_WAITING,
+)
+
+
+def admission_snapshot() -> List[Dict[str, int | float | str]]:
+    return [
+        limiter.snapshot() for limiter in (subscriptions_limiter, dispatch_limiter, preview_batch_limiter)
+    ]
@@ -6,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes.contests import router as contests_router
 from app.api.routes.users import router as users_router
 from app.core.database import init_db
+from app.dependencies.admission import admission_snapshot
 
 app = FastAPI(title="Codeforces Contests API", version="0.2.0")
 
@@ -30,6 +31,11 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/health/admission")
+async def admission_health() -> list[dict[str, int | float | str]]:
+    return admission_snapshot()
+
+
 def configure_routes() -> None:
     app.include_router(contests_router)
     app.include_router(users_router)
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime
 from pydantic import BaseModel, EmailStr, Field
-from typing import List
+from typing import List, Protocol
+
+from app.core.config import PREVIEW_BATCH_MAX_USERS
 
 
 class UserCreate(BaseModel):
@@ -43,6 +45,19 @@ class ContestSubscriptionOut(BaseModel):
         from_attributes = True
 
 
+class ContestSubscriptionFields(Protocol):
+    """Read-only subscription fields shared by ORM objects, column rows and ContestSubscriptionOut."""
+
+    @property
+    def contest_id(self) -> int: ...
+
+    @property
+    def contest_name(self) -> str: ...
+
+    @property
+    def start_time_utc(self) -> datetime | None: ...
+
+
 class NotificationPreview(BaseModel):
     contest_id: int
     contest_name: str
@@ -51,6 +66,16 @@ class NotificationPreview(BaseModel):
     reminders_local_formatted: List[str]
 
 
+class NotificationPreviewBatchRequest(BaseModel):
+    # Enforced in the route so oversize batches get a 400 like other bad payloads
+    user_ids: List[int] = Field(json_schema_extra={"maxItems": PREVIEW_BATCH_MAX_USERS})
+
+
+class UserNotificationPreview(BaseModel):
+    user_id: int
+    previews: List[NotificationPreview]
+
+
 class NotificationDispatchResponse(BaseModel):
     sent_count: int
     errors: List[str]
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict, List, NamedTuple, Sequence
+
+from app.core.config import CALENDAR_CACHE_MAX_ENTRIES, CALENDAR_CACHE_TTL_SECONDS
+from app.models.user import ContestSubscriptionFields, UserOut
+from app.services.scheduling import ReminderSettings, reminder_offsets
+from app.services.users import on_user_committed
+
+ICAL_DATETIME_FORMAT = "%Y%m%dT%H%M%SZ"
+ICAL_LINE_LIMIT = 75
+
+
+class CalendarFeed(NamedTuple):
+    body: str
+    etag: str
+    last_modified: datetime
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": "private, no-cache",
+        }
+
+    def is_not_modified(self, if_none_match: str | None, if_modified_since: str | None) -> bool:
+        # If-None-Match takes precedence over If-Modified-Since and uses weak comparison
+        # (RFC 9110, 13.1.2 and 13.2.2)
+        if if_none_match is not None:
+            candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in candidates or self.etag.removeprefix("W/") in candidates
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return self.last_modified <= since
+        return False
+
+
+class _FeedEntry(NamedTuple):
+    # The last stored feed is kept after invalidation so its validators carry over
+    feed: CalendarFeed | None
+    stored_at: float
+    fresh: bool
+    generation: int
+
+
+class CalendarFeedCache:
+    """Per-process LRU of rendered feeds.
+
+    Writes handled by this process invalidate the user's entry; the TTL bounds how long
+    a write handled by another worker can go unnoticed. Validators are derived from the
+    feed content, so a re-render that produces the same events keeps its ETag and
+    Last-Modified and clients keep getting 304s.
+    """
+
+    def __init__(
+        self, ttl_seconds: int, max_entries: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[int, _FeedEntry] = OrderedDict()
+        self._counter = itertools.count(1)
+        # Generation reported for users without an entry; raised on eviction so a
+        # render that started before its user was invalidated and evicted is not stored
+        self._evicted_generation = 0
+
+    def get(self, user_id: int) -> CalendarFeed | None:
+        entry = self._entries.get(user_id)
+        if entry is None or not entry.fresh:
+            return None
+        if self._clock() - entry.stored_at >= self._ttl_seconds:
+            self._entries[user_id] = entry._replace(fresh=False)
+            return None
+        self._entries.move_to_end(user_id)
+        return entry.feed
+
+    def generation(self, user_id: int) -> int:
+        entry = self._entries.get(user_id)
+        return self._evicted_generation if entry is None else entry.generation
+
+    def store(self, user_id: int, generation: int, body: str) -> CalendarFeed:
+        etag = _content_etag(body)
+        entry = self._entries.get(user_id)
+        previous = entry.feed if entry is not None else None
+        if previous is not None and previous.etag == etag:
+            last_modified = previous.last_modified
+        else:
+            last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        feed = CalendarFeed(body=body, etag=etag, last_modified=last_modified)
+        # Skip caching if the user was invalidated while this feed was being rendered
+        if self.generation(user_id) == generation:
+            self._put(user_id, _FeedEntry(feed, self._clock(), True, generation))
+        return feed
+
+    def invalidate(self, user_id: int) -> None:
+        entry = self._entries.get(user_id)
+        feed = entry.feed if entry is not None else None
+        self._put(user_id, _FeedEntry(feed, 0.0, False, next(self._counter)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._evicted_generation = next(self._counter)
+
+    def _put(self, user_id: int, entry: _FeedEntry) -> None:
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self._max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._evicted_generation = max(self._evicted_generation, evicted.generation)
+
+
+calendar_cache = CalendarFeedCache(CALENDAR_CACHE_TTL_SECONDS, CALENDAR_CACHE_MAX_ENTRIES)
+
+on_user_committed(calendar_cache.invalidate)
+
+
+def _content_etag(body: str) -> str:
+    # DTSTAMP is the render time, so leave it out; bodies that differ only there are
+    # semantically equivalent, which is what a weak validator promises
+    digest = hashlib.sha256()
+    for line in body.split("\r\n"):
+        if not line.startswith("DTSTAMP:"):
+            digest.update(line.encode())
+            digest.update(b"\n")
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def _escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold_line(line: str) -> str:
+    encoded = line.encode()
+    if len(encoded) <= ICAL_LINE_LIMIT:
+        return line
+
+    parts: List[str] = []
+    current = ""
+    limit = ICAL_LINE_LIMIT
+    for char in line:
+        if len((current + char).encode()) > limit:
+            parts.append(current)
+            current = ""
+            # Continuation lines start with a space, which counts toward the limit
+            limit = ICAL_LINE_LIMIT - 1
+        current += char
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+def _format_trigger(offset: timedelta) -> str:
+    minutes = int(offset.total_seconds() // 60)
+    sign = "-" if minutes < 0 else ""
+    return f"{sign}PT{abs(minutes)}M"
+
+
+def render_calendar(
+    user: UserOut, subscriptions: Sequence[ContestSubscriptionFields], now: datetime | None = None
+) -> str:
+    now = now or datetime.now(timezone.utc)
+    stamp = now.strftime(ICAL_DATETIME_FORMAT)
+    offsets = reminder_offsets(
+        ReminderSettings(user.reminder_count, user.reminder_start_minutes, user.reminder_interval_minutes)
+    )
+
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Codeforces Contests API//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        "X-WR-CALNAME:Codeforces contests",
+    ]
+    for sub in subscriptions:
+        if sub.start_time_utc is None:
+            continue
+        start_time = sub.start_time_utc
+        if start_time.tzinfo is None:
+            # MySQL DATETIME columns come back naive but are stored in UTC
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        start = start_time.astimezone(timezone.utc).strftime(ICAL_DATETIME_FORMAT)
+        lines.extend(
+            [
+                "BEGIN:VEVENT",
+                f"UID:contest-{sub.contest_id}-user-{user.id}@codeforces-api",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{start}",
+                f"SUMMARY:{_escape_text(sub.contest_name)}",
+                f"URL:https://codeforces.com/contests/{sub.contest_id}",
+            ]
+        )
+        for offset in offsets:
+            lines.extend(
+                [
+                    "BEGIN:VALARM",
+                    "ACTION:DISPLAY",
+                    f"DESCRIPTION:{_escape_text(sub.contest_name)}",
+                    f"TRIGGER:{_format_trigger(offset)}",
+                    "END:VALARM",
+                ]
+            )
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold_line(line) for line in lines) + "\r\n"
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Sequence
 
 import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 
 from app.core.config import AWS_SES_REGION, AWS_SES_SENDER
-from app.db.models import ContestSubscription, NotificationLog, User
+from app.db.models import NotificationLog
+from app.models.user import ContestSubscriptionFields, NotificationPreview, UserOut
+from app.services.scheduling import (
+    ReminderSettings,
+    build_reminder_schedules,
+    format_local_schedules,
+)
 
 
 def build_reminder_schedule(
@@ -16,31 +22,42 @@ def build_reminder_schedule(
     start_minutes_before: int,
     interval_minutes: int,
 ) -> List[datetime]:
-    if start_time_utc is None:
-        return []
-
-    first_reminder = start_time_utc - timedelta(minutes=start_minutes_before)
-    return [first_reminder + timedelta(minutes=interval_minutes * i) for i in range(reminder_count)]
+    settings = ReminderSettings(reminder_count, start_minutes_before, interval_minutes)
+    return list(build_reminder_schedules([start_time_utc], [settings])[0])
 
 
 def format_local_times(times: List[datetime], timezone_name: str) -> List[str]:
-    try:
-        from zoneinfo import ZoneInfo
-    except Exception:
-        return []
+    return list(format_local_schedules([times], [timezone_name])[0])
+
 
-    formatted: List[str] = []
-    zone = ZoneInfo(timezone_name)
-    for dt in times:
-        formatted.append(dt.astimezone(zone).strftime("%Y-%m-%d %I:%M %p"))
-    return formatted
+def build_notification_previews(
+    subscriptions: Sequence[ContestSubscriptionFields],
+    users: Sequence[UserOut],
+) -> List[NotificationPreview]:
+    """Build previews for subscriptions paired index-by-index with their owners."""
+    settings = [
+        ReminderSettings(user.reminder_count, user.reminder_start_minutes, user.reminder_interval_minutes)
+        for user in users
+    ]
+    schedules = build_reminder_schedules([sub.start_time_utc for sub in subscriptions], settings)
+    local_times = format_local_schedules(schedules, [user.timezone for user in users])
+    return [
+        NotificationPreview(
+            contest_id=sub.contest_id,
+            contest_name=sub.contest_name,
+            start_time_utc=sub.start_time_utc,
+            reminders_utc=reminders,
+            reminders_local_formatted=formatted,
+        )
+        for sub, reminders, formatted in zip(subscriptions, schedules, local_times)
+    ]
 
 
 def get_ses_client():
     return boto3.client("ses", region_name=AWS_SES_REGION)
 
 
-def build_email_body(user: User, subscription: ContestSubscription, reminders_local: List[str]) -> str:
+def build_email_body(user: UserOut, subscription: ContestSubscriptionFields, reminders_local: List[str]) -> str:
     lines = [
         f"Hi {user.cf_handle or 'Codeforces user'},",
         "",
@@ -53,7 +70,9 @@ def build_email_body(user: User, subscription: ContestSubscription, reminders_lo
     return "\n".join(lines)
 
 
-def send_email_notification(user: User, subscription: ContestSubscription, reminders_local: List[str]) -> None:
+def send_email_notification(
+    user: UserOut, subscription: ContestSubscriptionFields, reminders_local: List[str]
+) -> None:
     if not AWS_SES_SENDER:
         raise RuntimeError("AWS_SES_SENDER is not configured")
 
@@ -74,6 +93,9 @@ def send_email_notification(user: User, subscription: ContestSubscription, remin
 
 def is_due(reminder_time: datetime, now: datetime | None = None) -> bool:
     now = now or datetime.now(timezone.utc)
+    if reminder_time.tzinfo is None:
+        # MySQL DATETIME columns come back naive but are stored in UTC
+        reminder_time = reminder_time.replace(tzinfo=timezone.utc)
     return reminder_time <= now
 
 
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+class ReminderSettings(NamedTuple):
+    count: int
+    start_minutes_before: int
+    interval_minutes: int
+
+
+@lru_cache(maxsize=None)
+def get_zone(timezone_name: str) -> ZoneInfo:
+    return ZoneInfo(timezone_name)
+
+
+@lru_cache(maxsize=1024)
+def reminder_offsets(settings: ReminderSettings) -> Tuple[timedelta, ...]:
+    """Offsets from contest start for every reminder, computed once per settings tuple."""
+    return tuple(
+        timedelta(minutes=settings.interval_minutes * i - settings.start_minutes_before)
+        for i in range(settings.count)
+    )
+
+
+def build_reminder_schedules(
+    start_times: Sequence[datetime | None],
+    settings: Sequence[ReminderSettings],
+) -> List[Tuple[datetime, ...]]:
+    """Compute reminder times for many subscriptions at once.
+
+    Most subscriptions share a handful of contests and reminder settings, so each
+    distinct (start, settings) pair is expanded once. Identical rows share the same
+    immutable tuple.
+    """
+    if len(start_times) != len(settings):
+        raise ValueError("start_times and settings must have the same length")
+
+    computed: Dict[Tuple[datetime, ReminderSettings], Tuple[datetime, ...]] = {}
+    schedules: List[Tuple[datetime, ...]] = []
+    for start, setting in zip(start_times, settings):
+        if start is None:
+            schedules.append(())
+            continue
+        key = (start, setting)
+        schedule = computed.get(key)
+        if schedule is None:
+            schedule = _expand(start, setting)
+            computed[key] = schedule
+        schedules.append(schedule)
+    return schedules
+
+
+def format_local_schedules(
+    schedules: Sequence[Sequence[datetime]],
+    timezone_names: Sequence[str],
+) -> List[Tuple[str, ...]]:
+    """Format reminder times in each subscription's timezone, grouped by zone.
+
+    Labels are assembled from epoch-second arithmetic: the zone offset is looked up
+    once per UTC day (per 15 minutes on transition days) and the date and clock parts
+    come from lookup tables, which avoids an ``astimezone``/``strftime`` per reminder.
+    Naive times are UTC, as stored. Rows for an unknown timezone come back empty,
+    and rows formatted from the same schedule share one immutable tuple.
+    """
+    if len(schedules) != len(timezone_names):
+        raise ValueError("schedules and timezone_names must have the same length")
+
+    by_zone: Dict[str, List[int]] = {}
+    for index, timezone_name in enumerate(timezone_names):
+        by_zone.setdefault(timezone_name, []).append(index)
+
+    formatted: List[Tuple[str, ...]] = [()] * len(schedules)
+    for timezone_name, indexes in by_zone.items():
+        try:
+            zone = get_zone(timezone_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            continue
+        day_offsets: Dict[int, int | None] = {}
+        bucket_offsets: Dict[int, int] = {}
+        day_labels: Dict[int, str] = {}
+        # Rows built from the same (start, settings) share one tuple, so format it once
+        rows: Dict[int, Tuple[str, ...]] = {}
+        for index in indexes:
+            schedule = schedules[index]
+            row = rows.get(id(schedule))
+            if row is None:
+                labels = []
+                for dt in schedule:
+                    if dt.tzinfo is None:
+                        dt = dt.replace(tzinfo=timezone.utc)
+                    seconds = int(dt.timestamp())
+                    offset = day_offsets.get(seconds // 86400)
+                    if offset is None:
+                        offset = _zone_offset(zone, seconds, day_offsets, bucket_offsets)
+                    day, second_of_day = divmod(seconds + offset, 86400)
+                    day_label = day_labels.get(day)
+                    if day_label is None:
+                        day_label = _day_label(day)
+                        day_labels[day] = day_label
+                    labels.append(f"{day_label} {_CLOCK_LABELS[second_of_day // 60]}")
+                row = tuple(labels)
+                rows[id(schedule)] = row
+            formatted[index] = row
+    return formatted
+
+
+def _expand(start: datetime, settings: ReminderSettings) -> Tuple[datetime, ...]:
+    current = start - timedelta(minutes=settings.start_minutes_before)
+    step = timedelta(minutes=settings.interval_minutes)
+    schedule = []
+    for _ in range(settings.count):
+        schedule.append(current)
+        current += step
+    return tuple(schedule)
+
+
+# tzdb transitions fall on quarter-hour boundaries, so one offset per bucket is exact
+_OFFSET_BUCKET_SECONDS = 900
+_CLOCK_LABELS = tuple(time(hour, minute).strftime("%I:%M %p") for hour in range(24) for minute in range(60))
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _utc_offset_seconds(zone: ZoneInfo, epoch_seconds: int) -> int:
+    return int(datetime.fromtimestamp(epoch_seconds, zone).utcoffset().total_seconds())
+
+
+def _zone_offset(
+    zone: ZoneInfo,
+    epoch_seconds: int,
+    day_offsets: Dict[int, int | None],
+    bucket_offsets: Dict[int, int],
+) -> int:
+    """Resolve a UTC offset, caching whole days that contain no transition as ``int``."""
+    day = epoch_seconds // 86400
+    if day not in day_offsets:
+        first = _utc_offset_seconds(zone, day * 86400)
+        last = _utc_offset_seconds(zone, day * 86400 + 86400 - _OFFSET_BUCKET_SECONDS)
+        day_offsets[day] = first if first == last else None
+        if first == last:
+            return first
+
+    bucket = epoch_seconds // _OFFSET_BUCKET_SECONDS
+    offset = bucket_offsets.get(bucket)
+    if offset is None:
+        offset = _utc_offset_seconds(zone, bucket * _OFFSET_BUCKET_SECONDS)
+        bucket_offsets[bucket] = offset
+    return offset
+
+
+def _day_label(epoch_day: int) -> str:
+    return date.fromordinal(_EPOCH_ORDINAL + epoch_day).strftime("%Y-%m-%d")
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Protocol, Sequence, Tuple
+
+from sqlalchemy import Row, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS
+from app.db.models import ContestSubscription, User
+from app.models.user import ContestSubscriptionFields, UserOut
+
+USER_COLUMNS = (
+    User.id,
+    User.email,
+    User.timezone,
+    User.cf_handle,
+    User.reminder_count,
+    User.reminder_start_minutes,
+    User.reminder_interval_minutes,
+    User.created_at,
+)
+SUBSCRIPTION_COLUMNS = (
+    ContestSubscription.id.label("subscription_id"),
+    ContestSubscription.user_id,
+    ContestSubscription.contest_id,
+    ContestSubscription.contest_name,
+    ContestSubscription.start_time_utc,
+)
+# Calendar feeds list events in start order; the other routes share it for stable output
+SUBSCRIPTION_ORDER = (ContestSubscription.start_time_utc, ContestSubscription.contest_id)
+
+
+class SubscriptionRow(ContestSubscriptionFields, Protocol):
+    """Row selected with ``SUBSCRIPTION_COLUMNS``."""
+
+    @property
+    def subscription_id(self) -> int: ...
+
+    @property
+    def user_id(self) -> int: ...
+
+
+class UserSettingsCache:
+    """Per-process LRU of user profiles.
+
+    Entries are dropped once a transaction in this process that updated or deleted
+    the User row commits; the TTL bounds staleness for writes made by other processes.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._data: OrderedDict[int, Tuple[float, UserOut]] = OrderedDict()
+
+    def get(self, user_id: int) -> UserOut | None:
+        entry = self._data.get(user_id)
+        if entry is None:
+            return None
+        fetched_at, user = entry
+        if time.monotonic() - fetched_at >= self._ttl_seconds:
+            del self._data[user_id]
+            return None
+        self._data.move_to_end(user_id)
+        return user
+
+    def put(self, user: UserOut) -> None:
+        self._data[user.id] = (time.monotonic(), user)
+        self._data.move_to_end(user.id)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._data.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+user_cache = UserSettingsCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES)
+
+
+_CHANGED_USER_IDS = "changed_user_ids"
+_user_change_callbacks: List[Callable[[int], None]] = [user_cache.invalidate]
+
+
+def on_user_committed(callback: Callable[[int], None]) -> Callable[[int], None]:
+    """Call ``callback(user_id)`` after a transaction that updated or deleted the user commits."""
+    _user_change_callbacks.append(callback)
+    return callback
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _record_changed_user(mapper, connection, target: User) -> None:
+    # Mapper events fire at flush; invalidating here would let a concurrent reader
+    # re-cache the old row before the transaction commits
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USER_IDS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_USER_IDS, ()):
+        for callback in _user_change_callbacks:
+            callback(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop(_CHANGED_USER_IDS, None)
+
+
+def _user_from_row(row: Row) -> UserOut:
+    return UserOut(
+        id=row.id,
+        email=row.email,
+        timezone=row.timezone,
+        cf_handle=row.cf_handle,
+        reminder_count=row.reminder_count,
+        reminder_start_minutes=row.reminder_start_minutes,
+        reminder_interval_minutes=row.reminder_interval_minutes,
+        created_at=row.created_at,
+    )
+
+
+async def get_user_settings(db: AsyncSession, user_id: int) -> UserOut | None:
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    result = await db.execute(select(*USER_COLUMNS).where(User.id == user_id))
+    row = result.first()
+    if row is None:
+        return None
+    user = _user_from_row(row)
+    user_cache.put(user)
+    return user
+
+
+async def get_users_settings(db: AsyncSession, user_ids: Iterable[int]) -> Dict[int, UserOut]:
+    users: Dict[int, UserOut] = {}
+    missing: List[int] = []
+    for user_id in user_ids:
+        user = user_cache.get(user_id)
+        if user is None:
+            missing.append(user_id)
+        else:
+            users[user_id] = user
+
+    if missing:
+        result = await db.execute(select(*USER_COLUMNS).where(User.id.in_(missing)))
+        for row in result:
+            user = _user_from_row(row)
+            user_cache.put(user)
+            users[user.id] = user
+    return users
+
+
+async def get_user_with_subscriptions(
+    db: AsyncSession, user_id: int
+) -> Tuple[UserOut, List[SubscriptionRow]] | None:
+    """Load a user's settings and subscription columns in a single round trip."""
+    user = user_cache.get(user_id)
+    if user is not None:
+        result = await db.execute(
+            select(*SUBSCRIPTION_COLUMNS)
+            .where(ContestSubscription.user_id == user_id)
+            .order_by(*SUBSCRIPTION_ORDER)
+        )
+        return user, list(result)
+
+    result = await db.execute(
+        select(*USER_COLUMNS, *SUBSCRIPTION_COLUMNS)
+        .outerjoin(ContestSubscription, ContestSubscription.user_id == User.id)
+        .where(User.id == user_id)
+        .order_by(*SUBSCRIPTION_ORDER)
+    )
+    rows = result.all()
+    if not rows:
+        return None
+
+    user = _user_from_row(rows[0])
+    user_cache.put(user)
+    # A user without subscriptions comes back as one row with NULL subscription columns
+    return user, [row for row in rows if row.subscription_id is not None]
+
+
+async def get_subscriptions_for_users(db: AsyncSession, user_ids: Sequence[int]) -> List[SubscriptionRow]:
+    result = await db.execute(
+        select(*SUBSCRIPTION_COLUMNS)
+        .where(ContestSubscription.user_id.in_(user_ids))
+        .order_by(ContestSubscription.user_id, *SUBSCRIPTION_ORDER)
+    )
+    return list(result)
@@ -0,0 +1,120 @@
+"""Run the FastAPI app in-process against a throwaway SQLite database.
+
+Benchmarks need ``aiosqlite`` (see requirements-dev.txt); Codeforces is replaced by
+a fixed contest list so runs are repeatable and offline. ``/contests`` answers
+immediately, like a warm cache, while Codeforces calls from the user routes can be
+slowed down to model the write path.
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Sequence
+
+import httpx
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.api.routes.contests as contests_routes
+import app.api.routes.users as users_routes
+from app.core.database import get_db
+from app.db import models
+from app.main import app
+from app.models.contest import Contest
+
+
+class BenchApp:
+    def __init__(self, contest_count: int = 20, codeforces_delay_seconds: float = 0.0) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{Path(self._tmpdir.name) / 'bench.db'}")
+        self._sessions = async_sessionmaker(self.engine, expire_on_commit=False, class_=AsyncSession)
+        self.statements = 0
+        start = datetime.now(timezone.utc).replace(second=0, microsecond=0) + timedelta(days=1)
+        self.contests = [
+            Contest(
+                id=1000 + i,
+                name=f"Codeforces Round {1000 + i} (Div. 2)",
+                phase="BEFORE",
+                start_time_utc=start + timedelta(hours=6 * i),
+                duration_seconds=7200,
+                relative_time_seconds=-86400,
+            )
+            for i in range(contest_count)
+        ]
+        self._codeforces_delay_seconds = codeforces_delay_seconds
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120
+        )
+
+    async def __aenter__(self) -> "BenchApp":
+        @event.listens_for(self.engine.sync_engine, "before_cursor_execute")
+        def _count(*_args) -> None:
+            self.statements += 1
+
+        async def _get_db():
+            async with self._sessions() as session:
+                yield session
+
+        async def _cached(auth=None) -> List[Contest]:
+            return self.contests
+
+        async def _slow(auth=None) -> List[Contest]:
+            if self._codeforces_delay_seconds:
+                await asyncio.sleep(self._codeforces_delay_seconds)
+            return self.contests
+
+        app.dependency_overrides[get_db] = _get_db
+        contests_routes.service.get_upcoming_contests = _cached
+        users_routes.service.get_upcoming_contests = _slow
+        async with self.engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        app.dependency_overrides.pop(get_db, None)
+        await self.client.aclose()
+        await self.engine.dispose()
+        self._tmpdir.cleanup()
+
+    async def seed_users(self, count: int, subscriptions_per_user: int) -> List[int]:
+        """Insert users with subscriptions directly, bypassing the API."""
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                insert(models.User),
+                [{"email": f"user{i}@example.com", "timezone": "Europe/Berlin"} for i in range(1, count + 1)],
+            )
+            rows = []
+            for user_id in range(1, count + 1):
+                for k in range(subscriptions_per_user):
+                    contest = self.contests[(user_id + k) % len(self.contests)]
+                    rows.append(
+                        {
+                            "user_id": user_id,
+                            "contest_id": contest.id,
+                            "contest_name": contest.name,
+                            "start_time_utc": contest.start_time_utc,
+                        }
+                    )
+            await conn.execute(insert(models.ContestSubscription), rows)
+        return list(range(1, count + 1))
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def describe(samples: Sequence[float]) -> str:
+    if not samples:
+        return "n/a"
+    return (
+        f"p50 {statistics.median(samples) * 1000:7.2f} ms  "
+        f"p99 {percentile(samples, 99) * 1000:7.2f} ms  "
+        f"max {max(samples) * 1000:7.2f} ms"
+    )
@@ -0,0 +1,89 @@
+"""Benchmark: cached-read latency while the write path is overloaded.
+
+Readers poll GET /contests and GET /health continuously. The overload phase then adds
+writer clients that hammer POST /users/{id}/subscriptions (whose Codeforces call is
+slowed down) and ignore Retry-After. Read latency is reported for both phases, along
+with how the writes were admitted or shed. Run from the backend directory:
+
+    python -m bench.bench_admission [--readers 20] [--writers 200] [--seconds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import List
+
+from app.dependencies.admission import admission_snapshot
+from bench._harness import BenchApp, describe
+
+
+async def _readers(bench: BenchApp, count: int, seconds: float) -> List[float]:
+    latencies: List[float] = []
+    deadline = time.perf_counter() + seconds
+
+    async def read() -> None:
+        while time.perf_counter() < deadline:
+            for path in ("/contests", "/health"):
+                started = time.perf_counter()
+                response = await bench.client.get(path)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+
+    await asyncio.gather(*(read() for _ in range(count)))
+    return latencies
+
+
+async def _writers(bench: BenchApp, user_ids: List[int], count: int, seconds: float, statuses: Counter) -> None:
+    deadline = time.perf_counter() + seconds
+    contest_id = bench.contests[0].id
+
+    async def write(user_id: int) -> None:
+        while time.perf_counter() < deadline:
+            response = await bench.client.post(f"/users/{user_id}/subscriptions", json={"contest_ids": [contest_id]})
+            statuses[response.status_code] += 1
+            if response.status_code == 503:
+                # Misbehaving client: retry almost immediately instead of honouring Retry-After
+                await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(write(user_ids[i % len(user_ids)]) for i in range(count)))
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with BenchApp(codeforces_delay_seconds=args.codeforces_delay) as bench:
+        user_ids = await bench.seed_users(args.writers, 1)
+        print(
+            f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per phase, "
+            f"Codeforces delay on writes {args.codeforces_delay * 1000:.0f} ms"
+        )
+
+        baseline = await _readers(bench, args.readers, args.seconds)
+        print(f"reads, idle writes       {len(baseline):6d} requests  {describe(baseline)}")
+
+        statuses: Counter = Counter()
+        writers = asyncio.create_task(_writers(bench, user_ids, args.writers, args.seconds, statuses))
+        await asyncio.sleep(args.seconds / 2)
+        peak = {limiter["name"]: limiter for limiter in admission_snapshot()}["save_subscriptions"]
+        loaded = await _readers(bench, args.readers, args.seconds / 2)
+        await writers
+        print(f"reads, overloaded writes {len(loaded):6d} requests  {describe(loaded)}")
+
+        print("writes: " + "  ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+        print(
+            f"save_subscriptions limiter at peak: active {peak['active']}/{peak['max_concurrency']}, "
+            f"waiting {peak['waiting']}/{peak['max_waiting']}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--writers", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--codeforces-delay", type=float, default=0.5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
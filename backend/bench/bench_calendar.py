@@ -0,0 +1,116 @@
+"""Load test: many calendar clients polling GET /users/{id}/calendar.ics at once.
+
+Each round every user polls concurrently with the validators from its previous
+response, the way calendar clients revalidate subscribed feeds. Between rounds a few
+users change their subscriptions, one round simulates a restarted worker (empty feed
+cache), one a no-op re-save and the last polls after the cache TTL has expired, which
+is what most production polls look like when clients revalidate every few hours. Run
+from the backend directory:
+
+    python -m bench.bench_calendar [--users 2000] [--rounds 7] [--concurrency 500]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Dict, List
+
+import app.api.routes.users as users_routes
+from app.core.config import CALENDAR_CACHE_MAX_ENTRIES, CALENDAR_CACHE_TTL_SECONDS
+from app.services.ical import CalendarFeedCache
+from bench._harness import BenchApp, describe
+
+
+async def _poll_round(bench: BenchApp, user_ids: List[int], etags: Dict[int, str], concurrency: int) -> None:
+    limit = asyncio.Semaphore(concurrency)
+    statuses: Counter = Counter()
+    latencies: List[float] = []
+
+    async def poll(user_id: int) -> None:
+        headers = {"If-None-Match": etags[user_id]} if user_id in etags else {}
+        async with limit:
+            started = time.perf_counter()
+            response = await bench.client.get(f"/users/{user_id}/calendar.ics", headers=headers)
+            latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] += 1
+        if response.status_code == 200:
+            etags[user_id] = response.headers["etag"]
+
+    statements_before = bench.statements
+    started = time.perf_counter()
+    await asyncio.gather(*(poll(user_id) for user_id in user_ids))
+    elapsed = time.perf_counter() - started
+    print(
+        f"  200: {statuses[200]:5d}  304: {statuses[304]:5d}  other: {sum(statuses.values()) - statuses[200] - statuses[304]:3d}"
+        f"  SQL statements: {bench.statements - statements_before:5d}"
+        f"  {len(user_ids) / elapsed:8.0f} req/s  {describe(latencies)}"
+    )
+
+
+class _Clock:
+    """Monotonic clock that the bench can move forward past the cache TTL."""
+
+    def __init__(self) -> None:
+        self.skipped = 0.0
+
+    def __call__(self) -> float:
+        return time.monotonic() + self.skipped
+
+
+def _feed_cache(clock: _Clock) -> CalendarFeedCache:
+    return CalendarFeedCache(CALENDAR_CACHE_TTL_SECONDS, CALENDAR_CACHE_MAX_ENTRIES, clock=clock)
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    clock = _Clock()
+    async with BenchApp(contest_count=20) as bench:
+        users_routes.calendar_cache = _feed_cache(clock)
+        user_ids = await bench.seed_users(args.users, args.subscriptions)
+        etags: Dict[int, str] = {}
+        contest_ids = [contest.id for contest in bench.contests]
+        print(f"{args.users} users x {args.subscriptions} subscriptions, concurrency {args.concurrency}")
+
+        for round_number in range(1, args.rounds + 1):
+            if round_number == 3:
+                changed = rng.sample(user_ids, max(1, args.users // 100))
+                for user_id in changed:
+                    await bench.client.post(
+                        f"/users/{user_id}/subscriptions", json={"contest_ids": rng.sample(contest_ids, 2)}
+                    )
+                print(f"round {round_number}: after {len(changed)} users changed subscriptions")
+            elif round_number == 4:
+                users_routes.calendar_cache = _feed_cache(clock)
+                print(f"round {round_number}: empty feed cache (restarted or different worker)")
+            elif round_number == 5:
+                user_id = user_ids[0]
+                current = (await bench.client.get(f"/users/{user_id}/subscriptions")).json()
+                await bench.client.post(
+                    f"/users/{user_id}/subscriptions", json={"contest_ids": [s["contest_id"] for s in current]}
+                )
+                print(f"round {round_number}: after a no-op re-save by user {user_id}")
+            elif round_number == 7:
+                clock.skipped += CALENDAR_CACHE_TTL_SECONDS
+                print(f"round {round_number}: {CALENDAR_CACHE_TTL_SECONDS}s later, every cached feed has expired")
+            elif round_number == 1:
+                print(f"round {round_number}: cold, clients have no validators")
+            else:
+                print(f"round {round_number}: warm")
+            await _poll_round(bench, user_ids, etags, args.concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--subscriptions", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark batch reminder scheduling against the per-subscription loop it replaced.
+
+Run from the backend directory:
+
+    python -m bench.bench_scheduling [--subscriptions 100000] [--contests 200] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Sequence, Tuple
+
+from app.services.scheduling import (
+    ReminderSettings,
+    build_reminder_schedules,
+    format_local_schedules,
+)
+
+TIMEZONES = ["UTC", "Europe/Berlin", "Asia/Kolkata", "America/New_York"]
+
+
+def _legacy(starts: Sequence[datetime], settings: Sequence[ReminderSettings], zones: Sequence[str]) -> List[List[str]]:
+    # Mirrors the pre-batch code: one schedule and one ZoneInfo lookup per subscription
+    from zoneinfo import ZoneInfo
+
+    out: List[List[str]] = []
+    for start, setting, zone_name in zip(starts, settings, zones):
+        first = start - timedelta(minutes=setting.start_minutes_before)
+        times = [first + timedelta(minutes=setting.interval_minutes * i) for i in range(setting.count)]
+        zone = ZoneInfo(zone_name)
+        out.append([dt.astimezone(zone).strftime("%Y-%m-%d %I:%M %p") for dt in times])
+    return out
+
+
+def _batch(
+    starts: Sequence[datetime], settings: Sequence[ReminderSettings], zones: Sequence[str]
+) -> List[Tuple[str, ...]]:
+    return format_local_schedules(build_reminder_schedules(starts, settings), zones)
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscriptions", type=int, default=100_000)
+    parser.add_argument("--contests", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    contest_starts = [base + timedelta(minutes=rng.randrange(0, 60 * 24 * 60, 5)) for _ in range(args.contests)]
+    presets = [ReminderSettings(3, 30, 10), ReminderSettings(1, 15, 1), ReminderSettings(5, 60, 10)]
+
+    def varied_settings() -> ReminderSettings:
+        return ReminderSettings(rng.randint(1, 10), rng.randint(0, 240), rng.randint(1, 120))
+
+    n = args.subscriptions
+    zones = [rng.choice(TIMEZONES) for _ in range(n)]
+    scenarios = {
+        "shared contests, default settings": (
+            [rng.choice(contest_starts) for _ in range(n)],
+            [rng.choice(presets) for _ in range(n)],
+        ),
+        "shared contests, varied settings": (
+            [rng.choice(contest_starts) for _ in range(n)],
+            [varied_settings() for _ in range(n)],
+        ),
+        "unique starts, varied settings": (
+            [base + timedelta(minutes=rng.randrange(0, 60 * 24 * 365)) for _ in range(n)],
+            [varied_settings() for _ in range(n)],
+        ),
+    }
+
+    print(f"{n} subscriptions, {args.contests} contests, {len(TIMEZONES)} timezones, median of {args.repeat}")
+    for name, (starts, settings) in scenarios.items():
+        assert [list(row) for row in _batch(starts, settings, zones)] == _legacy(starts, settings, zones)
+        legacy = _time(lambda: _legacy(starts, settings, zones), args.repeat)
+        batch = _time(lambda: _batch(starts, settings, zones), args.repeat)
+        print(f"{name:36s} legacy {legacy * 1000:8.1f} ms  batch {batch * 1000:8.1f} ms  x{legacy / batch:.1f}")
+
+
+if __name__ == "__main__":
+    main()
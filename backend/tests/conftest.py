@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.api.routes.users as users_routes
+from app.core.database import get_db
+from app.db import models
+from app.main import app
+from app.models.contest import Contest
+from app.services.ical import calendar_cache
+from app.services.users import user_cache
+
+START = datetime.now(timezone.utc).replace(second=0, microsecond=0) + timedelta(days=1)
+CONTESTS = [
+    Contest(
+        id=2000 + i,
+        name=f"Codeforces Round {2000 + i}",
+        phase="BEFORE",
+        start_time_utc=START + timedelta(hours=i),
+        duration_seconds=7200,
+        relative_time_seconds=-86400,
+    )
+    for i in range(3)
+]
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    def __call__(self, conn, cursor, statement, *args) -> None:
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # TestClient runs each request on a fresh event loop, so connections must not be pooled
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+
+    async def create_tables() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def queries(engine) -> StatementCounter:
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+def client(engine, monkeypatch) -> TestClient:
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def override_get_db():
+        async with sessions() as session:
+            yield session
+
+    async def upcoming(auth=None) -> List[Contest]:
+        return CONTESTS
+
+    monkeypatch.setattr(users_routes.service, "get_upcoming_contests", upcoming)
+    app.dependency_overrides[get_db] = override_get_db
+    user_cache.clear()
+    calendar_cache.clear()
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+    user_cache.clear()
+    calendar_cache.clear()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from fastapi import HTTPException
+
+from app.dependencies.admission import AdmissionLimiter
+
+
+def _limiter(max_queue_seconds: float = 1.0, max_waiting: int = 1) -> AdmissionLimiter:
+    return AdmissionLimiter(
+        "test", max_concurrency=1, max_queue_seconds=max_queue_seconds, max_waiting=max_waiting, retry_after_seconds=7
+    )
+
+
+async def _admit(limiter: AdmissionLimiter) -> AsyncGenerator[None, None]:
+    # Drive the dependency the way FastAPI does: run to the yield, close after the response
+    request = limiter()
+    await request.__anext__()
+    return request
+
+
+async def _settle() -> None:
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_admits_and_releases_slot():
+    async def scenario() -> None:
+        limiter = _limiter()
+        request = await _admit(limiter)
+        assert limiter.snapshot()["active"] == 1
+        await request.aclose()
+        assert (limiter.snapshot()["active"], limiter.snapshot()["admitted"]) == (0, 1)
+        await (await _admit(limiter)).aclose()
+
+    asyncio.run(scenario())
+
+
+def test_sheds_with_retry_after_when_queue_is_full():
+    async def scenario() -> None:
+        limiter = _limiter(max_waiting=1)
+        holder = await _admit(limiter)
+        waiter = asyncio.create_task(_admit(limiter))
+        await _settle()
+        assert limiter.snapshot()["waiting"] == 1
+
+        with pytest.raises(HTTPException) as excinfo:
+            await _admit(limiter)
+        assert excinfo.value.status_code == 503
+        assert excinfo.value.headers == {"Retry-After": "7"}
+        assert limiter.snapshot()["shed"] == 1
+
+        await holder.aclose()
+        await (await waiter).aclose()
+        snapshot = limiter.snapshot()
+        assert (snapshot["active"], snapshot["waiting"], snapshot["admitted"]) == (0, 0, 2)
+
+    asyncio.run(scenario())
+
+
+def test_sheds_after_queue_deadline():
+    async def scenario() -> None:
+        limiter = _limiter(max_queue_seconds=0.05)
+        holder = await _admit(limiter)
+
+        with pytest.raises(HTTPException) as excinfo:
+            await _admit(limiter)
+        assert excinfo.value.status_code == 503
+        assert excinfo.value.headers["Retry-After"] == "7"
+        snapshot = limiter.snapshot()
+        assert (snapshot["waiting"], snapshot["shed"], snapshot["active"]) == (0, 1, 1)
+        await holder.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_requests_release_their_place():
+    async def scenario() -> None:
+        limiter = _limiter()
+        holder = await _admit(limiter)
+        waiter = asyncio.create_task(_admit(limiter))
+        await _settle()
+
+        # A client that disconnects while queued gives up its place in the queue
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.snapshot()["waiting"] == 0
+
+        # An admitted request torn down mid-handler releases its slot
+        with pytest.raises(asyncio.CancelledError):
+            await holder.athrow(asyncio.CancelledError())
+        snapshot = limiter.snapshot()
+        assert (snapshot["active"], snapshot["admitted"], snapshot["shed"]) == (0, 1, 0)
+        await asyncio.wait_for(_admit(limiter), timeout=0.1)
+
+    asyncio.run(scenario())
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from app.services.ical import CalendarFeedCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_expired_feed_is_re_rendered_with_same_validators():
+    clock = FakeClock()
+    cache = CalendarFeedCache(ttl_seconds=60, max_entries=10, clock=clock)
+    first = cache.store(1, cache.generation(1), "BEGIN:VCALENDAR\r\n")
+
+    clock.now = 60
+    assert cache.get(1) is None
+    again = cache.store(1, cache.generation(1), "BEGIN:VCALENDAR\r\n")
+
+    assert (again.etag, again.last_modified) == (first.etag, first.last_modified)
+    assert cache.get(1) == again
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = CalendarFeedCache(ttl_seconds=60, max_entries=2)
+    for user_id in (1, 2):
+        cache.store(user_id, cache.generation(user_id), f"feed {user_id}")
+    cache.get(1)
+    cache.store(3, cache.generation(3), "feed 3")
+
+    assert cache.get(1) is not None
+    assert cache.get(2) is None
+    assert len(cache._entries) == 2
+
+
+def test_render_started_before_invalidation_is_not_stored_after_eviction():
+    cache = CalendarFeedCache(ttl_seconds=60, max_entries=1)
+    generation = cache.generation(1)
+    cache.invalidate(1)
+    cache.store(2, cache.generation(2), "feed 2")  # evicts user 1
+
+    cache.store(1, generation, "stale feed")
+
+    assert cache.get(1) is None
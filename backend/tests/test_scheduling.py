@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.scheduling import ReminderSettings, build_reminder_schedules, format_local_schedules
+
+START = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+SETTINGS = ReminderSettings(2, 30, 15)
+
+
+@pytest.fixture
+def server_timezone():
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = "Asia/Kolkata"
+    time.tzset()
+    yield
+    if previous is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+
+def test_naive_times_are_formatted_as_utc(server_timezone):
+    naive = build_reminder_schedules([START.replace(tzinfo=None)], [SETTINGS])
+    aware = build_reminder_schedules([START], [SETTINGS])
+
+    assert format_local_schedules(naive, ["UTC"]) == [("2026-03-01 11:30 AM", "2026-03-01 11:45 AM")]
+    assert format_local_schedules(naive, ["Europe/Berlin"]) == format_local_schedules(aware, ["Europe/Berlin"])
+
+
+def test_unknown_timezone_only_blanks_its_own_rows():
+    schedules = build_reminder_schedules([START, START, START], [SETTINGS] * 3)
+
+    formatted = format_local_schedules(schedules, ["Mars/Base", "UTC", ""])
+
+    assert formatted == [(), ("2026-03-01 11:30 AM", "2026-03-01 11:45 AM"), ()]
+
+
+def test_rows_from_one_schedule_share_a_tuple():
+    schedules = build_reminder_schedules([START, START], [SETTINGS] * 2)
+
+    formatted = format_local_schedules(schedules, ["Asia/Kolkata", "Asia/Kolkata"])
+
+    assert isinstance(formatted[0], tuple)
+    assert formatted[0] is formatted[1]
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.models import User
+
+from app.services.ical import calendar_cache
+from app.services.users import user_cache
+from tests.conftest import CONTESTS
+
+
+def _create_user_with_subscriptions(client) -> int:
+    user_id = client.post("/users", json={"email": "user@example.com", "timezone": "Europe/Berlin"}).json()["id"]
+    # Subscribe in reverse start order so the ordering of responses is observable
+    contest_ids = [contest.id for contest in reversed(CONTESTS)]
+    response = client.post(f"/users/{user_id}/subscriptions", json={"contest_ids": contest_ids})
+    assert response.status_code == 200
+    return user_id
+
+
+@pytest.mark.parametrize(
+    ("method", "path"),
+    [
+        ("get", "/users/{id}/subscriptions"),
+        ("get", "/users/{id}/notification-preview"),
+        ("get", "/users/{id}/calendar.ics"),
+        ("post", "/users/{id}/notifications/dispatch"),
+    ],
+)
+@pytest.mark.parametrize("user_cached", [True, False])
+def test_user_read_routes_run_one_query(client, queries, method, path, user_cached):
+    user_id = _create_user_with_subscriptions(client)
+    if not user_cached:
+        user_cache.invalidate(user_id)
+    calendar_cache.invalidate(user_id)
+
+    queries.reset()
+    response = getattr(client, method)(path.format(id=user_id))
+
+    assert response.status_code == 200
+    assert queries.count == 1, queries.statements
+
+
+def test_get_user_reads_through_cache(client, queries):
+    user_id = _create_user_with_subscriptions(client)
+
+    queries.reset()
+    assert client.get(f"/users/{user_id}").status_code == 200
+    assert queries.count == 0
+
+    user_cache.invalidate(user_id)
+    assert client.get(f"/users/{user_id}").json()["email"] == "user@example.com"
+    assert queries.count == 1
+    assert client.get(f"/users/{user_id}").status_code == 200
+    assert queries.count == 1
+
+
+def test_user_without_subscriptions(client, queries):
+    user_id = client.post("/users", json={"email": "empty@example.com"}).json()["id"]
+    user_cache.invalidate(user_id)
+
+    queries.reset()
+    assert client.get(f"/users/{user_id}/subscriptions").json() == []
+    assert queries.count == 1
+
+
+def test_unknown_user_is_404(client):
+    assert client.get("/users/999").status_code == 404
+    assert client.get("/users/999/subscriptions").status_code == 404
+    assert client.get("/users/999/calendar.ics").status_code == 404
+
+
+def test_subscriptions_and_feed_are_ordered_by_start(client):
+    user_id = _create_user_with_subscriptions(client)
+    user_cache.invalidate(user_id)
+
+    listed = [sub["contest_id"] for sub in client.get(f"/users/{user_id}/subscriptions").json()]
+    assert listed == [contest.id for contest in CONTESTS]
+
+    feed = client.get(f"/users/{user_id}/calendar.ics").text
+    starts = [line for line in feed.split("\r\n") if line.startswith("DTSTART:")]
+    assert starts == sorted(starts) and len(starts) == len(CONTESTS)
+
+
+def test_conditional_calendar_poll_skips_database(client, queries):
+    user_id = _create_user_with_subscriptions(client)
+    etag = client.get(f"/users/{user_id}/calendar.ics").headers["etag"]
+
+    queries.reset()
+    response = client.get(f"/users/{user_id}/calendar.ics", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert queries.count == 0
+
+
+def test_save_subscriptions_ignores_cached_profile(client, engine):
+    user_id = client.post("/users", json={"email": "gone@example.com"}).json()["id"]
+    assert user_cache.get(user_id) is not None
+
+    # Delete outside the ORM, as another worker would, so the cached profile survives
+    async def delete_user() -> None:
+        async with engine.begin() as conn:
+            await conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+
+    asyncio.run(delete_user())
+    response = client.post(f"/users/{user_id}/subscriptions", json={"contest_ids": [CONTESTS[0].id]})
+    assert response.status_code == 404
+
+
+def test_batch_preview_survives_unknown_timezone(client):
+    valid_id = _create_user_with_subscriptions(client)
+    broken_id = client.post("/users", json={"email": "mars@example.com", "timezone": "Mars/Base"}).json()["id"]
+    client.post(f"/users/{broken_id}/subscriptions", json={"contest_ids": [CONTESTS[0].id]})
+
+    response = client.post("/users/notification-preview", json={"user_ids": [valid_id, broken_id]})
+
+    assert response.status_code == 200
+    previews = {entry["user_id"]: entry["previews"] for entry in response.json()}
+    assert all(preview["reminders_local_formatted"] for preview in previews[valid_id])
+    assert previews[broken_id][0]["reminders_local_formatted"] == []
+
+
+def test_caches_are_invalidated_after_commit_not_flush(client, engine):
+    user_id = _create_user_with_subscriptions(client)
+    client.get(f"/users/{user_id}/calendar.ics")
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def update_email(commit: bool) -> bool:
+        async with sessions() as session:
+            user = await session.get(User, user_id)
+            user.email = "changed@example.com"
+            await session.flush()
+            cached_after_flush = user_cache.get(user_id) is not None and calendar_cache.get(user_id) is not None
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+            return cached_after_flush
+
+    assert asyncio.run(update_email(commit=False))
+    assert user_cache.get(user_id) is not None
+    assert asyncio.run(update_email(commit=True))
+    assert user_cache.get(user_id) is None
+    assert calendar_cache.get(user_id) is None
+    assert client.get(f"/users/{user_id}").json()["email"] == "changed@example.com"